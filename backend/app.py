@@ -6,8 +6,12 @@ Main application file
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import os
-import tempfile
-import json
+import atexit
+import hashlib
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from resume_parser import ResumeParser
 from skill_extractor import SkillExtractor
@@ -26,16 +30,251 @@ DATABASE_URL = os.getenv(
 )
 app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_pre_ping': True,      # Drop dead connections before use
+    'pool_size': 10,
+    'query_cache_size': 1200    # Compiled SQL statements kept across requests
+}
 db.init_app(app)
 
-# Create temp folder for uploaded files
-UPLOAD_FOLDER = tempfile.gettempdir()
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+# Uploads are parsed in memory, never written to disk
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
-# Create database tables
-with app.app_context():
+# Number of most recent analyses returned by /api/history
+HISTORY_LIMIT = 50
+
+# Shared worker pool for independent per-request work
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# Analyses waiting to be written by the background database writer
+_DB_QUEUE = queue.Queue()
+_DB_BATCH_SIZE = 32
+_DB_FLUSH_INTERVAL = 0.1  # seconds
+_DB_SHUTDOWN_TIMEOUT = 10  # seconds to wait for queued saves at exit
+_DB_STOP = object()  # Queued at exit to tell the writer to finish up
+
+@app.cli.command('init-db')
+def init_db():
+    """Create database tables"""
     db.create_all()
+    print("Database tables created")
+
+
+def _write_batch(batch):
+    """
+    Save a batch of analyses in one commit.
+    If the commit fails, retry one record at a time so only bad rows are lost.
+    """
+    with app.app_context():
+        try:
+            db.session.bulk_save_objects(batch)
+            db.session.commit()
+            return
+        except Exception:
+            db.session.rollback()
+        
+        for record in batch:
+            try:
+                db.session.bulk_save_objects([record])
+                db.session.commit()
+            except Exception as db_error:
+                db.session.rollback()
+                print(f"Database save error ({record.filename}): {str(db_error)}")
+
+
+def _db_writer():
+    """
+    Background loop that saves queued analyses in batches,
+    so requests don't wait on the database commit
+    """
+    while True:
+        record = _DB_QUEUE.get()
+        if record is _DB_STOP:
+            return
+        batch = [record]
+        deadline = time.monotonic() + _DB_FLUSH_INTERVAL
+        stopping = False
+        
+        # Collect whatever else arrives within the flush interval
+        while len(batch) < _DB_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                record = _DB_QUEUE.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if record is _DB_STOP:
+                stopping = True
+                break
+            batch.append(record)
+        
+        _write_batch(batch)
+        if stopping:
+            return
+
+
+_DB_WRITER = None
+_DB_WRITER_LOCK = threading.Lock()
+
+
+def _save_in_background(record):
+    """
+    Queue an analysis record for the background database writer
+    """
+    global _DB_WRITER
+    # Started lazily so each forked server worker runs its own writer
+    with _DB_WRITER_LOCK:
+        if _DB_WRITER is None or not _DB_WRITER.is_alive():
+            _DB_WRITER = threading.Thread(target=_db_writer, name='db-writer', daemon=True)
+            _DB_WRITER.start()
+    _DB_QUEUE.put(record)
+
+
+@atexit.register
+def _flush_db_queue():
+    """
+    Save analyses still queued when the process exits (worker restart, deploy)
+    """
+    writer = _DB_WRITER
+    if writer is not None and writer.is_alive():
+        _DB_QUEUE.put(_DB_STOP)
+        writer.join(timeout=_DB_SHUTDOWN_TIMEOUT)
+        if writer.is_alive():
+            print("Database writer did not finish; some analyses were not saved")
+            return
+    
+    # Anything the writer did not get to is saved here directly
+    batch = []
+    while True:
+        try:
+            record = _DB_QUEUE.get_nowait()
+        except queue.Empty:
+            break
+        if record is not _DB_STOP:
+            batch.append(record)
+    if batch:
+        _write_batch(batch)
+
+
+def _upload_too_large():
+    """
+    Check the declared request size before any of the body is read
+    """
+    return (request.content_length is not None and
+            request.content_length > app.config['MAX_CONTENT_LENGTH'])
+
+
+def _hash_stream(stream, chunk_size=64 * 1024):
+    """
+    sha256 of a file stream, read in chunks and rewound afterwards
+    """
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def _content_hash(resume_hash, extension, job_description):
+    """
+    Build the cache key for a resume + job description pair.
+    The extension is included because it picks the parser.
+    """
+    job_hash = hashlib.sha256(job_description.encode('utf-8')).hexdigest()
+    key = resume_hash + extension.lower() + job_hash
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _analysis_response(record):
+    """
+    Build the "analysis" part of the /api/analyze response from a record
+    """
+    skills_found = record.skills_found
+    missing_skills = record.missing_skills
+    return {
+        "job_match_score": record.job_match_score,
+        "ats_score": int(record.ats_score),  # Stored as a float column
+        "resume_strength": record.resume_strength,
+        "skills_found": {
+            "total": len(SkillExtractor.get_all_skills_flat(skills_found)),
+            "by_category": skills_found
+        },
+        "missing_skills": {
+            "count": missing_skills['count'],
+            "list": missing_skills['list'][:10]  # Top 10 missing skills
+        },
+        "recommendation": record.recommendation
+    }
+
+
+def _stored_analysis(content_hash):
+    """
+    Load a stored analysis by content hash (indexed lookup).
+    Read from the database every time, so deletes are seen by all workers.
+    
+    Returns:
+        "analysis" response dictionary, or None if nothing is stored
+    """
+    record = ResumeAnalysis.query.filter_by(content_hash=content_hash).first()
+    if record is None:
+        return None
+    return _analysis_response(record)
+
+
+def _analyze(resume_stream, filename, job_description, content_hash):
+    """
+    Run the full analysis pipeline on an uploaded resume
+    
+    Returns:
+        Unsaved ResumeAnalysis record, or a parse error dictionary
+    """
+    # Step 1: Parse resume
+    parse_result = ResumeParser.parse_stream(
+        resume_stream,
+        os.path.splitext(filename)[1]
+    )
+    
+    if "error" in parse_result:
+        return parse_result
+    
+    resume_text = parse_result['cleaned_text']
+    
+    # Steps 2 and 3: Extract skills from resume and job description concurrently
+    resume_future = _EXECUTOR.submit(SkillExtractor.extract_skills, resume_text)
+    job_future = _EXECUTOR.submit(SkillExtractor.extract_skills, job_description)
+    
+    resume_skills_dict = resume_future.result()
+    resume_skills_flat = SkillExtractor.get_all_skills_flat(resume_skills_dict)
+    
+    job_skills_dict = job_future.result()
+    job_skills_flat = SkillExtractor.get_all_skills_flat(job_skills_dict)
+    
+    # Step 4: Find missing skills
+    missing_skills = JobMatcher.find_missing_skills(
+        resume_skills_flat, 
+        job_skills_flat
+    )
+    
+    # Step 5: Generate matching report
+    report = JobMatcher.generate_match_report(
+        resume_text,
+        job_description,
+        resume_skills_flat,
+        missing_skills
+    )
+    
+    return ResumeAnalysis(
+        filename=filename,
+        job_description=job_description,
+        content_hash=content_hash,
+        job_match_score=report['job_match_score'],
+        ats_score=report['ats_score'],
+        resume_strength=report['resume_strength'],
+        skills_found=resume_skills_dict,
+        missing_skills={'count': len(missing_skills), 'list': missing_skills},
+        recommendation=report['recommendation']
+    )
 
 
 @app.route('/', methods=['GET'])
@@ -72,6 +311,9 @@ def analyze_resume():
     }
     """
     try:
+        if _upload_too_large():
+            return jsonify({"error": "File is too large (max 16MB)"}), 413
+        
         # Check if job description is provided
         if 'job_description' not in request.form:
             return jsonify({"error": "Job description is required"}), 400
@@ -91,79 +333,45 @@ def analyze_resume():
                 resume_file.filename.lower().endswith('.docx')):
             return jsonify({"error": "Only PDF and DOCX files are supported"}), 400
         
-        # Save file temporarily
-        temp_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_file.filename)
-        resume_file.save(temp_path)
-        
-        # Step 1: Parse resume
-        parse_result = ResumeParser.parse_resume(temp_path)
-        
-        if "error" in parse_result:
-            return jsonify(parse_result), 400
-        
-        resume_text = parse_result['cleaned_text']
-        
-        # Step 2: Extract skills from resume
-        resume_skills_dict = SkillExtractor.extract_skills(resume_text)
-        resume_skills_flat = SkillExtractor.get_all_skills_flat(resume_skills_dict)
-        
-        # Step 3: Extract skills from job description
-        job_skills_dict = SkillExtractor.extract_skills(job_description)
-        job_skills_flat = SkillExtractor.get_all_skills_flat(job_skills_dict)
-        
-        # Step 4: Find missing skills
-        missing_skills = JobMatcher.find_missing_skills(
-            resume_skills_flat, 
-            job_skills_flat
+        # Hash the upload in chunks; when already stored it is never parsed
+        content_hash = _content_hash(
+            _hash_stream(resume_file.stream),
+            os.path.splitext(resume_file.filename)[1],
+            job_description
         )
         
-        # Step 5: Generate matching report
-        report = JobMatcher.generate_match_report(
-            resume_text,
+        # Reuse a previous analysis of the same resume + job description
+        try:
+            stored = _stored_analysis(content_hash)
+            if stored is not None:
+                return jsonify({
+                    "success": True,
+                    "analysis": stored
+                }), 200
+        except Exception as db_error:
+            print(f"Database lookup error: {str(db_error)}")
+            db.session.rollback()
+            # Fall through and analyze from scratch
+        
+        analysis_record = _analyze(
+            resume_file.stream,
+            resume_file.filename,
             job_description,
-            resume_skills_flat,
-            missing_skills
+            content_hash
         )
         
-        # Clean up temp file
-        os.remove(temp_path)
+        if isinstance(analysis_record, dict):
+            return jsonify(analysis_record), 400
         
-        # Save analysis to database
-        try:
-            analysis_record = ResumeAnalysis(
-                filename=resume_file.filename,
-                job_type=job_description[:100],  # Store first 100 chars as job type
-                job_description=job_description,
-                job_match_score=report['job_match_score'],
-                ats_score=report['ats_score'],
-                resume_strength=report['resume_strength'],
-                skills_found=json.dumps(resume_skills_dict),
-                missing_skills=json.dumps({'count': len(missing_skills), 'list': missing_skills}),
-                recommendation=report['recommendation']
-            )
-            db.session.add(analysis_record)
-            db.session.commit()
-        except Exception as db_error:
-            print(f"Database save error: {str(db_error)}")
-            # Continue even if database save fails
+        analysis = _analysis_response(analysis_record)
+        
+        # Save analysis to database in the background
+        _save_in_background(analysis_record)
         
         # Return complete analysis
         return jsonify({
             "success": True,
-            "analysis": {
-                "job_match_score": report['job_match_score'],
-                "ats_score": report['ats_score'],
-                "resume_strength": report['resume_strength'],
-                "skills_found": {
-                    "total": report['total_skills_found'],
-                    "by_category": resume_skills_dict
-                },
-                "missing_skills": {
-                    "count": report['missing_skills_count'],
-                    "list": report['missing_skills']
-                },
-                "recommendation": report['recommendation']
-            }
+            "analysis": analysis
         }), 200
     
     except Exception as e:
@@ -176,6 +384,9 @@ def extract_skills_only():
     Endpoint to extract skills from just a resume
     """
     try:
+        if _upload_too_large():
+            return jsonify({"error": "File is too large (max 16MB)"}), 413
+        
         if 'resume_file' not in request.files:
             return jsonify({"error": "Resume file is required"}), 400
         
@@ -184,19 +395,20 @@ def extract_skills_only():
         if resume_file.filename == '':
             return jsonify({"error": "No file selected"}), 400
         
-        # Save file temporarily
-        temp_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_file.filename)
-        resume_file.save(temp_path)
-        
         # Parse and extract skills
-        parse_result = ResumeParser.parse_resume(temp_path)
+        parse_result = ResumeParser.parse_stream(
+            resume_file.stream,
+            os.path.splitext(resume_file.filename)[1]
+        )
+        
+        if "error" in parse_result:
+            return jsonify(parse_result), 400
+        
         resume_text = parse_result['cleaned_text']
         
         skills_dict = SkillExtractor.extract_skills(resume_text)
         summary = SkillExtractor.skill_summary(skills_dict)
         
-        os.remove(temp_path)
-        
         return jsonify({
             "success": True,
             "skills": summary
@@ -212,23 +424,27 @@ def calculate_ats():
     Endpoint to calculate ATS score for a resume
     """
     try:
+        if _upload_too_large():
+            return jsonify({"error": "File is too large (max 16MB)"}), 413
+        
         if 'resume_file' not in request.files:
             return jsonify({"error": "Resume file is required"}), 400
         
         resume_file = request.files['resume_file']
         
-        # Save file temporarily
-        temp_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_file.filename)
-        resume_file.save(temp_path)
-        
         # Parse and calculate ATS
-        parse_result = ResumeParser.parse_resume(temp_path)
+        parse_result = ResumeParser.parse_stream(
+            resume_file.stream,
+            os.path.splitext(resume_file.filename)[1]
+        )
+        
+        if "error" in parse_result:
+            return jsonify(parse_result), 400
+        
         resume_text = parse_result['cleaned_text']
         
         ats_score = JobMatcher.calculate_ats_score(resume_text)
         
-        os.remove(temp_path)
-        
         return jsonify({
             "success": True,
             "ats_score": ats_score,
@@ -245,11 +461,27 @@ def get_analysis_history():
     Get all previous analyses from database
     """
     try:
-        analyses = ResumeAnalysis.query.order_by(ResumeAnalysis.created_at.desc()).all()
+        # Only load the columns shown in the list; details come from /api/history/<id>
+        analyses = ResumeAnalysis.query.with_entities(
+            ResumeAnalysis.id,
+            ResumeAnalysis.filename,
+            ResumeAnalysis.job_type.label('job_type'),
+            ResumeAnalysis.job_match_score,
+            ResumeAnalysis.ats_score,
+            ResumeAnalysis.resume_strength,
+            ResumeAnalysis.created_at
+        ).order_by(ResumeAnalysis.created_at.desc()).limit(HISTORY_LIMIT).all()
+        
+        # Number of stored analyses, not just the ones returned
+        total_analyses = db.session.query(db.func.count(ResumeAnalysis.id)).scalar()
+        
         return jsonify({
             "success": True,
-            "total": len(analyses),
-            "analyses": [analysis.to_dict() for analysis in analyses]
+            "total": total_analyses,
+            "analyses": [
+                {**analysis._asdict(), 'created_at': analysis.created_at.isoformat()}
+                for analysis in analyses
+            ]
         }), 200
     except Exception as e:
         return jsonify({"error": f"Failed to retrieve history: {str(e)}"}), 500
@@ -261,7 +493,7 @@ def get_analysis_detail(analysis_id):
     Get details of a specific analysis
     """
     try:
-        analysis = ResumeAnalysis.query.get(analysis_id)
+        analysis = db.session.get(ResumeAnalysis, analysis_id)
         if not analysis:
             return jsonify({"error": "Analysis not found"}), 404
         
@@ -279,7 +511,7 @@ def delete_analysis(analysis_id):
     Delete a specific analysis
     """
     try:
-        analysis = ResumeAnalysis.query.get(analysis_id)
+        analysis = db.session.get(ResumeAnalysis, analysis_id)
         if not analysis:
             return jsonify({"error": "Analysis not found"}), 404
         
@@ -300,9 +532,14 @@ def get_statistics():
     Get overall statistics from all analyses
     """
     try:
-        total_analyses = ResumeAnalysis.query.count()
-        avg_match_score = db.session.query(db.func.avg(ResumeAnalysis.job_match_score)).scalar() or 0
-        avg_ats_score = db.session.query(db.func.avg(ResumeAnalysis.ats_score)).scalar() or 0
+        # Single aggregate query instead of one scan per statistic
+        total_analyses, avg_match_score, avg_ats_score = db.session.query(
+            db.func.count(ResumeAnalysis.id),
+            db.func.avg(ResumeAnalysis.job_match_score),
+            db.func.avg(ResumeAnalysis.ats_score)
+        ).one()
+        avg_match_score = avg_match_score or 0
+        avg_ats_score = avg_ats_score or 0
         
         return jsonify({
             "success": True,
@@ -329,5 +566,7 @@ def internal_error(error):
 
 
 if __name__ == '__main__':
-    # Run the Flask app
+    # Run the Flask development server (use wsgi.py with gunicorn in production)
+    with app.app_context():
+        db.create_all()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -3,8 +3,27 @@ Job Matcher Module
 Matches resume with job description using string similarity
 """
 
+from bisect import bisect_right
 from collections import Counter
+from itertools import islice
 import math
+import re
+
+
+# Section headings and contact keywords looked for by calculate_ats_score
+_ATS_SECTIONS = frozenset(('experience', 'skills', 'education', 'projects', 'summary'))
+_ATS_SECTIONS_LEN = len(_ATS_SECTIONS)
+_ATS_CONTACT_KEYWORDS = ('email', 'phone', '@')
+
+# The lookahead lets overlapping keywords all be found in one scan
+_ATS_PATTERN = re.compile(
+    '(?=(' + '|'.join(sorted(_ATS_SECTIONS) + list(_ATS_CONTACT_KEYWORDS)) + '))',
+    re.IGNORECASE
+)
+
+# Resume strength by ATS score: below 40, 40-59, 60-79, 80 and up
+_STRENGTH_THRESHOLDS = (40, 60, 80)
+_STRENGTH_LABELS = ("Needs Improvement", "Fair", "Good", "Strong")
 
 
 class JobMatcher:
@@ -13,7 +32,27 @@ class JobMatcher:
     """
     
     @staticmethod
-    def calculate_match_score(resume_text, job_description):
+    def _tokenize(text):
+        """
+        Lowercase and split text into words once
+        
+        Bigrams are kept as (word, next_word) tuples rather than joined
+        strings, so no new string is built or hashed per pair.
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Tuple of (word list, set of words longer than 2 chars, set of bigrams)
+        """
+        words = text.lower().split()
+        unigrams = {word for word in words if len(word) > 2}
+        bigrams = set(zip(words, islice(words, 1, None)))
+        
+        return words, unigrams, bigrams
+    
+    @staticmethod
+    def calculate_match_score(resume_text, job_description, resume_tokens=None, job_tokens=None):
         """
         Calculate similarity between resume and job description
         Using cosine similarity with simple word tokenization
@@ -21,18 +60,20 @@ class JobMatcher:
         Args:
             resume_text: Cleaned resume text
             job_description: Job description text
+            resume_tokens: Optional _tokenize() result for resume_text
+            job_tokens: Optional _tokenize() result for job_description
             
         Returns:
             Match percentage (0-100)
         """
         try:
-            # Convert to lowercase and split into words
-            resume_words = set(resume_text.lower().split())
-            job_words = set(job_description.lower().split())
+            if resume_tokens is None:
+                resume_tokens = JobMatcher._tokenize(resume_text)
+            if job_tokens is None:
+                job_tokens = JobMatcher._tokenize(job_description)
             
-            # Remove very short words
-            resume_words = {w for w in resume_words if len(w) > 2}
-            job_words = {w for w in job_words if len(w) > 2}
+            _, resume_words, resume_bigrams = resume_tokens
+            _, job_words, job_bigrams = job_tokens
             
             # Calculate Jaccard similarity
             if len(job_words) == 0:
@@ -48,7 +89,7 @@ class JobMatcher:
             match_score = round(similarity * 100, 2)
             
             # Also check for common phrases
-            phrase_bonus = JobMatcher._phrase_matching(resume_text, job_description)
+            phrase_bonus = JobMatcher._phrase_matching(resume_bigrams, job_bigrams)
             
             # Combine scores
             final_score = min(100, (match_score * 0.7) + (phrase_bonus * 0.3))
@@ -58,25 +99,16 @@ class JobMatcher:
             return 0
     
     @staticmethod
-    def _phrase_matching(resume_text, job_description):
+    def _phrase_matching(resume_bigrams, job_bigrams):
         """
         Bonus points for matching phrases (not just single words)
+        
+        Args:
+            resume_bigrams: Set of (word, next_word) pairs from the resume
+            job_bigrams: Set of (word, next_word) pairs from the job description
         """
         bonus = 0
         
-        # Split into bigrams (2-word phrases)
-        resume_bigrams = set()
-        job_bigrams = set()
-        
-        resume_words = resume_text.lower().split()
-        job_words = job_description.lower().split()
-        
-        for i in range(len(resume_words) - 1):
-            resume_bigrams.add(f"{resume_words[i]} {resume_words[i+1]}")
-        
-        for i in range(len(job_words) - 1):
-            job_bigrams.add(f"{job_words[i]} {job_words[i+1]}")
-        
         # Count matching bigrams
         matching_bigrams = len(resume_bigrams & job_bigrams)
         
@@ -107,20 +139,23 @@ class JobMatcher:
         Find skills in job description that are missing in resume
         
         Args:
-            resume_skills: List of resume skills
-            job_skills: List of job description skills
+            resume_skills: Resume skills, ideally the lowercased frozenset
+                from SkillExtractor.get_all_skills_flat()
+            job_skills: Job description skills, same format as resume_skills
             
         Returns:
-            List of missing skills
+            Sorted list of missing skills
         """
-        resume_set = set(skill.lower() for skill in resume_skills)
-        job_set = set(skill.lower() for skill in job_skills)
+        # Other iterables may not be lowercased yet
+        if not isinstance(resume_skills, frozenset):
+            resume_skills = frozenset(skill.lower() for skill in resume_skills)
+        if not isinstance(job_skills, frozenset):
+            job_skills = frozenset(skill.lower() for skill in job_skills)
         
-        missing = list(job_set - resume_set)
-        return sorted(missing)
+        return sorted(job_skills - resume_skills)
     
     @staticmethod
-    def calculate_ats_score(resume_text):
+    def calculate_ats_score(resume_text, resume_tokens=None):
         """
         Calculate ATS (Applicant Tracking System) compatibility score
         
@@ -131,6 +166,7 @@ class JobMatcher:
         
         Args:
             resume_text: Cleaned resume text
+            resume_tokens: Optional _tokenize() result for resume_text
             
         Returns:
             ATS score (0-100)
@@ -138,170 +174,57 @@ class JobMatcher:
         score = 0
         
         # 1. Check text length (ideal: 400-1000 words)
-        word_count = len(resume_text.split())
+        if resume_tokens is None:
+            word_count = len(resume_text.split())
+        else:
+            word_count = len(resume_tokens[0])
         if 400 <= word_count <= 1000:
             score += 20
         elif 200 <= word_count <= 1500:
             score += 10
         
+        # Collect every section/contact keyword in a single scan
+        hits = {match.group(1).lower() for match in _ATS_PATTERN.finditer(resume_text)}
+        
         # 2. Check for important sections
-        sections = ['experience', 'skills', 'education', 'projects', 'summary']
-        found_sections = 0
-        for section in sections:
-            if section.lower() in resume_text.lower():
-                found_sections += 1
+        found_sections = len(hits & _ATS_SECTIONS)
         
-        score += (found_sections / len(sections)) * 40
+        score += found_sections * 40 // _ATS_SECTIONS_LEN
         
         # 3. Check for contact info (email and phone)
-        email_pattern = r'[\w\.-]+@[\w\.-]+\.\w+'
-        phone_pattern = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-        
-        if len(resume_text.split('\n')) > 5:  # Good formatting
+        if resume_text.count('\n') + 1 > 5:  # Good formatting (more than 5 lines)
             score += 10
         
-        if 'email' in resume_text.lower() or '@' in resume_text:
+        if 'email' in hits or '@' in hits:
             score += 15
         
-        if 'phone' in resume_text.lower():
+        if 'phone' in hits:
             score += 15
         
-        return min(round(score), 100)
+        return min(score, 100)
     
     @staticmethod
-    def generate_match_report(resume_text, job_description, resume_skills, missing_skills):
+    def _analyze_pair(resume_text, job_description):
         """
-        Generate complete matching report
+        Compute the match and ATS scores together, lowercasing and
+        tokenizing each text and scanning the resume for ATS keywords
+        only once
         
-        Args:
-            resume_text: Cleaned resume text
-            job_description: Job description text
-            resume_skills: Found resume skills
-            missing_skills: Missing skills
-            
         Returns:
-            Dictionary with comprehensive report
+            Tuple of (match score, ATS score)
         """
-        match_score = JobMatcher.calculate_match_score(resume_text, job_description)
-        ats_score = JobMatcher.calculate_ats_score(resume_text)
-        
-        # Determine resume strength
-        if ats_score >= 80:
-            strength = "Strong"
-        elif ats_score >= 60:
-            strength = "Good"
-        elif ats_score >= 40:
-            strength = "Fair"
-        else:
-            strength = "Needs Improvement"
-        
-        return {
-            'job_match_score': match_score,
-            'ats_score': ats_score,
-            'resume_strength': strength,
-            'total_skills_found': len(resume_skills),
-            'missing_skills_count': len(missing_skills),
-            'missing_skills': missing_skills[:10],  # Top 10 missing skills
-            'recommendation': JobMatcher._get_recommendation(match_score, ats_score)
-        }
-    
-    @staticmethod
-    def _get_recommendation(match_score, ats_score):
-        """
-        Generate recommendation based on scores
-        """
-        if match_score >= 80 and ats_score >= 80:
-            return "Excellent match! Your resume aligns well with the job."
-        elif match_score >= 60 and ats_score >= 60:
-            return "Good match! Consider adding more relevant skills."
-        elif match_score >= 40:
-            return "Fair match. Add more skills from the job description."
-        else:
-            return "Low match. Significant skill improvements needed."
-
-    
-    @staticmethod
-    def extract_keywords(text):
-        """
-        Extract important keywords from text
-        
-        Args:
-            text: Input text
-            
-        Returns:
-            List of keywords
-        """
-        # Split text and filter short words
-        words = text.lower().split()
-        keywords = [word.strip('.,!?;:') for word in words if len(word) > 3]
-        return list(set(keywords))
-    
-    @staticmethod
-    def find_missing_skills(resume_skills, job_skills):
-        """
-        Find skills in job description that are missing in resume
-        
-        Args:
-            resume_skills: List of resume skills
-            job_skills: List of job description skills
-            
-        Returns:
-            List of missing skills
-        """
-        resume_set = set(skill.lower() for skill in resume_skills)
-        job_set = set(skill.lower() for skill in job_skills)
-        
-        missing = list(job_set - resume_set)
-        return sorted(missing)
-    
-    @staticmethod
-    def calculate_ats_score(resume_text):
-        """
-        Calculate ATS (Applicant Tracking System) compatibility score
-        
-        This evaluates:
-        - Text length (resume should be 400-1000 words)
-        - Section presence (Experience, Skills, Education)
-        - Formatting (proper spacing)
-        
-        Args:
-            resume_text: Cleaned resume text
-            
-        Returns:
-            ATS score (0-100)
-        """
-        score = 0
-        
-        # 1. Check text length (ideal: 400-1000 words)
-        word_count = len(resume_text.split())
-        if 400 <= word_count <= 1000:
-            score += 20
-        elif 200 <= word_count <= 1500:
-            score += 10
-        
-        # 2. Check for important sections
-        sections = ['experience', 'skills', 'education', 'projects', 'summary']
-        found_sections = 0
-        for section in sections:
-            if section.lower() in resume_text.lower():
-                found_sections += 1
-        
-        score += (found_sections / len(sections)) * 40
-        
-        # 3. Check for contact info (email and phone)
-        email_pattern = r'[\w\.-]+@[\w\.-]+\.\w+'
-        phone_pattern = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-        
-        if len(resume_text.split('\n')) > 5:  # Good formatting
-            score += 10
-        
-        if 'email' in resume_text.lower() or '@' in resume_text:
-            score += 15
-        
-        if 'phone' in resume_text.lower():
-            score += 15
-        
-        return min(round(score), 100)
+        resume_tokens = JobMatcher._tokenize(resume_text)
+        job_tokens = JobMatcher._tokenize(job_description)
+        
+        match_score = JobMatcher.calculate_match_score(
+            resume_text,
+            job_description,
+            resume_tokens,
+            job_tokens
+        )
+        ats_score = JobMatcher.calculate_ats_score(resume_text, resume_tokens)
+        
+        return match_score, ats_score
     
     @staticmethod
     def generate_match_report(resume_text, job_description, resume_skills, missing_skills):
@@ -317,18 +240,10 @@ class JobMatcher:
         Returns:
             Dictionary with comprehensive report
         """
-        match_score = JobMatcher.calculate_match_score(resume_text, job_description)
-        ats_score = JobMatcher.calculate_ats_score(resume_text)
+        match_score, ats_score = JobMatcher._analyze_pair(resume_text, job_description)
         
         # Determine resume strength
-        if ats_score >= 80:
-            strength = "Strong"
-        elif ats_score >= 60:
-            strength = "Good"
-        elif ats_score >= 40:
-            strength = "Fair"
-        else:
-            strength = "Needs Improvement"
+        strength = _STRENGTH_LABELS[bisect_right(_STRENGTH_THRESHOLDS, ats_score)]
         
         return {
             'job_match_score': match_score,
@@ -4,8 +4,9 @@ Defines the structure of the database tables
 """
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import datetime
-import json
 
 db = SQLAlchemy()
 
@@ -18,23 +19,39 @@ class ResumeAnalysis(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(255), nullable=False)
-    job_type = db.Column(db.String(100), nullable=False)
     job_description = db.Column(db.Text, nullable=False)
     
+    # sha256 of the resume bytes + job description, used to reuse analyses
+    content_hash = db.Column(db.String(64), index=True)
+    
     # Analysis Results
     job_match_score = db.Column(db.Float, nullable=False)
     ats_score = db.Column(db.Float, nullable=False)
     resume_strength = db.Column(db.String(50), nullable=False)
     
-    # Skills Data (stored as JSON)
-    skills_found = db.Column(db.Text, nullable=False)  # JSON
-    missing_skills = db.Column(db.Text, nullable=False)  # JSON
+    # Skills Data (decoded by the database driver)
+    skills_found = db.Column(JSONB, nullable=False)
+    missing_skills = db.Column(JSONB, nullable=False)
     
     # Metadata
     recommendation = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Serves the newest-first listing in /api/history
+        db.Index('ix_resume_analyses_created_at', created_at.desc()),
+    )
+    
+    @hybrid_property
+    def job_type(self):
+        """First 100 characters of the job description"""
+        return self.job_description[:100]
+    
+    @job_type.expression
+    def job_type(cls):
+        return db.func.substr(cls.job_description, 1, 100)
+    
     def __repr__(self):
         return f'<ResumeAnalysis {self.id}: {self.filename}>'
     
@@ -47,8 +64,8 @@ class ResumeAnalysis(db.Model):
             'job_match_score': self.job_match_score,
             'ats_score': self.ats_score,
             'resume_strength': self.resume_strength,
-            'skills_found': json.loads(self.skills_found),
-            'missing_skills': json.loads(self.missing_skills),
+            'skills_found': self.skills_found,
+            'missing_skills': self.missing_skills,
             'recommendation': self.recommendation,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
@@ -5,7 +5,25 @@ Extracts text from PDF and DOCX files
 
 import PyPDF2
 from docx import Document
+import os
 import re
+import threading
+
+try:
+    # PDFium-based extractor, much faster than PyPDF2; optional
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# Patterns used by clean_text, compiled once at import
+_WHITESPACE = re.compile(r'\s+')
+_SPECIAL_CHARS = re.compile(r'[^\w\s\.\-@]')
+
+# Start of the text extract_text_from_pdf/docx return when a file can't be read
+_READ_ERROR_PREFIXES = ("Error reading PDF: ", "Error reading DOCX: ")
+
+# PDFium is not thread-safe, so only one thread may use it at a time
+_PDFIUM_LOCK = threading.Lock()
 
 
 class ResumeParser:
@@ -19,40 +37,62 @@ class ResumeParser:
         Extract text from a PDF file
         
         Args:
-            file_path: Path to the PDF file
+            file_path: Path to the PDF file, or a binary file-like object
             
         Returns:
             Extracted text as string
         """
-        text = ""
+        if pdfium is not None:
+            try:
+                return ResumeParser._extract_text_with_pdfium(file_path)
+            except Exception:
+                # Fall back to PyPDF2 for files PDFium can't handle
+                if hasattr(file_path, 'seek'):
+                    file_path.seek(0)
+        
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                # Loop through all pages and extract text
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-            return text
+            pdf_reader = PyPDF2.PdfReader(file_path)
+            # Extract text from all pages and join once at the end
+            return "".join(page.extract_text() or "" for page in pdf_reader.pages)
         except Exception as e:
             return f"Error reading PDF: {str(e)}"
     
+    @staticmethod
+    def _extract_text_with_pdfium(file_path):
+        """
+        Extract text from a PDF file using PDFium
+        """
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                pages_text = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    try:
+                        pages_text.append(textpage.get_text_bounded())
+                    finally:
+                        # Close children before the document, still under the lock
+                        textpage.close()
+                        page.close()
+                return "\n".join(pages_text)
+            finally:
+                pdf.close()
+    
     @staticmethod
     def extract_text_from_docx(file_path):
         """
         Extract text from a DOCX (Word) file
         
         Args:
-            file_path: Path to the DOCX file
+            file_path: Path to the DOCX file, or a binary file-like object
             
         Returns:
             Extracted text as string
         """
-        text = ""
         try:
             doc = Document(file_path)
-            # Loop through all paragraphs
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            # One line per paragraph, joined once at the end
+            return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
         except Exception as e:
             return f"Error reading DOCX: {str(e)}"
     
@@ -68,29 +108,27 @@ class ResumeParser:
             Cleaned text
         """
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE.sub(' ', text)
         # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\.\-@]', '', text)
+        text = _SPECIAL_CHARS.sub('', text)
         return text.strip()
     
     @staticmethod
-    def parse_resume(file_path):
+    def _parse(source, extension):
         """
-        Main method to parse any resume file
-        
-        Args:
-            file_path: Path to resume file
-            
-        Returns:
-            Dictionary with extracted and cleaned text
+        Extract and clean text from a path or stream with the given extension
         """
-        if file_path.lower().endswith('.pdf'):
-            raw_text = ResumeParser.extract_text_from_pdf(file_path)
-        elif file_path.lower().endswith('.docx'):
-            raw_text = ResumeParser.extract_text_from_docx(file_path)
+        if extension == '.pdf':
+            raw_text = ResumeParser.extract_text_from_pdf(source)
+        elif extension == '.docx':
+            raw_text = ResumeParser.extract_text_from_docx(source)
         else:
             return {"error": "Unsupported file format. Use PDF or DOCX"}
         
+        # The extractors return their error message as the text; don't score it
+        if raw_text.startswith(_READ_ERROR_PREFIXES):
+            return {"error": raw_text}
+        
         cleaned_text = ResumeParser.clean_text(raw_text)
         
         return {
@@ -98,3 +136,31 @@ class ResumeParser:
             "cleaned_text": cleaned_text,
             "length": len(cleaned_text)
         }
+    
+    @staticmethod
+    def parse_resume(file_path):
+        """
+        Main method to parse any resume file
+        
+        Args:
+            file_path: Path to resume file
+            
+        Returns:
+            Dictionary with extracted and cleaned text
+        """
+        return ResumeParser._parse(file_path, os.path.splitext(file_path)[1].lower())
+    
+    @staticmethod
+    def parse_stream(stream, extension):
+        """
+        Parse a resume straight from an in-memory or uploaded file,
+        without writing it to disk
+        
+        Args:
+            stream: Binary file-like object with the resume contents
+            extension: File extension, e.g. '.pdf' or '.docx'
+            
+        Returns:
+            Dictionary with extracted and cleaned text
+        """
+        return ResumeParser._parse(stream, extension.lower())
@@ -3,7 +3,17 @@ Skill Extractor Module
 Extracts technical skills from resume text
 """
 
+from collections import OrderedDict
+from itertools import chain
+import hashlib
 import re
+import threading
+
+try:
+    # Aho-Corasick automaton for single-pass keyword search; optional
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 
 class SkillExtractor:
@@ -31,7 +41,7 @@ class SkillExtractor:
         ],
         'devops_tools': [
             'docker', 'kubernetes', 'jenkins', 'gitlab', 'github', 'terraform',
-            'ansible', 'ci/cd', 'git', 'docker', 'prometheus', 'grafana'
+            'ansible', 'ci/cd', 'git', 'prometheus', 'grafana'
         ],
         'ai_ml': [
             'machine learning', 'tensorflow', 'pytorch', 'scikit-learn',
@@ -39,7 +49,7 @@ class SkillExtractor:
             'gemini', 'llm', 'bert', 'gpt'
         ],
         'other_tools': [
-            'git', 'linux', 'windows', 'macos', 'agile', 'scrum', 'jira',
+            'linux', 'windows', 'macos', 'agile', 'scrum', 'jira',
             'confluence', 'slack', 'rest api', 'graphql', 'postman'
         ]
     }
@@ -55,43 +65,28 @@ class SkillExtractor:
         Returns:
             Dictionary with found skills by category
         """
-        resume_lower = resume_text.lower()
-        found_skills = {
-            'programming_languages': [],
-            'web_frameworks': [],
-            'databases': [],
-            'cloud_platforms': [],
-            'devops_tools': [],
-            'ai_ml': [],
-            'other_tools': []
-        }
-        
-        # Search for each skill in the resume
-        for category, skills in SkillExtractor.TECH_SKILLS.items():
-            for skill in skills:
-                # Use word boundaries to find exact matches
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, resume_lower, re.IGNORECASE):
-                    if skill not in found_skills[category]:
-                        found_skills[category].append(skill)
+        hits = _find_skills(resume_text)
         
+        # Group the skills found by category, one sorted list per TECH_SKILLS key
+        found_skills = {category: [] for category in _CATEGORIES}
+        for skill in sorted(hits):
+            found_skills[_SKILL_CATEGORY[skill]].append(skill)
         return found_skills
     
     @staticmethod
     def get_all_skills_flat(found_skills):
         """
-        Flatten all found skills into a single list
+        Flatten all found skills into a single set
         
         Args:
             found_skills: Dictionary from extract_skills()
             
         Returns:
-            Flat list of all skills
+            Frozenset of all skills
         """
-        all_skills = []
-        for category in found_skills.values():
-            all_skills.extend(category)
-        return sorted(list(set(all_skills)))
+        # Categories don't share skills (see _dedupe_tech_skills), so one
+        # pass over all of them is enough
+        return frozenset(chain.from_iterable(found_skills.values()))
     
     @staticmethod
     def skill_summary(found_skills):
@@ -104,10 +99,142 @@ class SkillExtractor:
         Returns:
             Summary with counts
         """
-        total_skills = sum(len(skills) for skills in found_skills.values())
+        by_category = {cat: len(skills) for cat, skills in found_skills.items()}
         
         return {
-            'total_skills_found': total_skills,
-            'by_category': {cat: len(skills) for cat, skills in found_skills.items()},
+            'total_skills_found': sum(by_category.values()),
+            'by_category': by_category,
             'skills': found_skills
         }
+
+
+def _is_whole_word(text, start, end):
+    """
+    True if text[start:end] is not part of a longer word
+    """
+    if start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_'):
+        return False
+    if end < len(text) and (text[end].isalnum() or text[end] == '_'):
+        return False
+    return True
+
+
+def _contains_whole_word(text, word):
+    """
+    True if word occurs in text other than as part of a longer word
+    """
+    index = text.find(word)
+    while index != -1:
+        if _is_whole_word(text, index, index + len(word)):
+            return True
+        index = text.find(word, index + 1)
+    return False
+
+
+def _dedupe_tech_skills():
+    """
+    Keep each skill only in the first category that lists it.
+    TECH_SKILLS has no duplicates; this guards against new ones.
+    """
+    seen = set()
+    for category, skills in SkillExtractor.TECH_SKILLS.items():
+        unique = []
+        for skill in skills:
+            if skill not in seen:
+                seen.add(skill)
+                unique.append(skill)
+        SkillExtractor.TECH_SKILLS[category] = unique
+
+
+def _build_automaton():
+    """
+    Build an Aho-Corasick automaton over every skill in TECH_SKILLS
+    """
+    automaton = ahocorasick.Automaton()
+    for _, skill in _FLAT_SKILLS:
+        automaton.add_word(skill, skill)
+    automaton.make_automaton()
+    return automaton
+
+
+def _find_skills(resume_text):
+    """
+    Set of every TECH_SKILLS entry found in the text.
+    Memoized: the same resume is often sent to several endpoints in a row.
+    The cache is keyed on a digest so it never holds on to the texts themselves.
+    """
+    key = hashlib.blake2b(resume_text.encode('utf-8'), digest_size=16).digest()
+    with _SKILL_CACHE_LOCK:
+        hits = _SKILL_CACHE.get(key)
+        if hits is not None:
+            _SKILL_CACHE.move_to_end(key)
+            return hits
+    
+    hits = _scan_skills(resume_text)
+    
+    with _SKILL_CACHE_LOCK:
+        _SKILL_CACHE[key] = hits
+        if len(_SKILL_CACHE) > _SKILL_CACHE_SIZE:
+            _SKILL_CACHE.popitem(last=False)
+    return hits
+
+
+def _scan_skills(resume_text):
+    """
+    Search the text for every TECH_SKILLS entry
+    """
+    resume_lower = resume_text.lower()
+    
+    if _AUTOMATON is not None:
+        # One pass over the text finds every skill occurrence
+        hits = set()
+        for end_index, skill in _AUTOMATON.iter(resume_lower):
+            start_index = end_index - len(skill) + 1
+            if _is_whole_word(resume_lower, start_index, end_index + 1):
+                hits.add(skill)
+    else:
+        # Plain-word skills are whole tokens; only the rest need a substring search
+        tokens = set(_WORD.findall(resume_lower))
+        hits = set(_WORD_SKILLS & tokens)
+        for skill, words in _PHRASE_SKILLS:
+            # Skip the search unless every word of the skill is a token
+            if words <= tokens and _contains_whole_word(resume_lower, skill):
+                hits.add(skill)
+    
+    return frozenset(hits)
+
+
+_dedupe_tech_skills()
+
+# TECH_SKILLS as one flat tuple of (category index, skill), so loops over
+# every skill don't walk the nested dict
+_CATEGORIES = tuple(SkillExtractor.TECH_SKILLS)
+_FLAT_SKILLS = tuple(
+    (category_index, skill)
+    for category_index, skills in enumerate(SkillExtractor.TECH_SKILLS.values())
+    for skill in skills
+)
+_SKILL_CATEGORY = {skill: _CATEGORIES[category_index] for category_index, skill in _FLAT_SKILLS}
+
+_AUTOMATON = _build_automaton() if ahocorasick is not None else None
+
+# _find_skills results, least recently used first: text digest -> frozenset
+_SKILL_CACHE = OrderedDict()
+_SKILL_CACHE_SIZE = 256
+_SKILL_CACHE_LOCK = threading.Lock()
+
+# Fallback when pyahocorasick isn't installed. A skill made only of word
+# characters ("python", "neo4j") is found exactly when it is a whole \w+ token,
+# so those are matched with one tokenization and a set intersection.
+_WORD = re.compile(r'\w+')
+_ALL_SKILLS = frozenset(_SKILL_CATEGORY)
+_WORD_SKILLS = frozenset(skill for skill in _ALL_SKILLS if _WORD.fullmatch(skill))
+
+# The few others ("machine learning", "c++", "ci/cd") are looked up with
+# str.find plus a whole-word check, which beats a regex alternation here.
+# Each is paired with its \w+ words: a whole-word occurrence of "ci/cd"
+# means "ci" and "cd" are both tokens, which is a free prefilter.
+_PHRASE_SKILLS = tuple(
+    (skill, frozenset(_WORD.findall(skill)))
+    for skill in sorted(_ALL_SKILLS - _WORD_SKILLS)
+)
@@ -3,7 +3,9 @@ Test script to analyze your resume using the Flask API
 """
 
 import requests
+from requests_toolbelt import MultipartEncoder
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 # API endpoint
 BASE_URL = "http://localhost:5000"
@@ -19,6 +21,34 @@ Strong skills in REST APIs, database management, and version control (Git) are r
 Experience with Docker, CI/CD, and agile development is a plus.
 """
 
+# Reuse one connection for all requests
+session = requests.Session()
+
+
+def upload(endpoint, data=None):
+    """
+    POST the resume (and optional form fields) to an endpoint,
+    streaming the file from disk instead of buffering the whole body
+    """
+    with open(RESUME_PATH, 'rb') as file:
+        fields = dict(data or {})
+        fields['resume_file'] = ('RESUME.pdf', file, 'application/pdf')
+        body = MultipartEncoder(fields=fields)
+        return session.post(
+            f"{BASE_URL}{endpoint}",
+            data=body,
+            headers={'Content-Type': body.content_type}
+        )
+
+
+# The tests are independent, so send all requests at once and
+# print the results in order as they complete
+executor = ThreadPoolExecutor(max_workers=4)
+health_future = executor.submit(session.get, f"{BASE_URL}/health")
+skills_future = executor.submit(upload, "/api/extract-skills")
+ats_future = executor.submit(upload, "/api/calculate-ats")
+analyze_future = executor.submit(upload, "/api/analyze", {'job_description': JOB_DESCRIPTION})
+
 print("=" * 60)
 print("🧠 AI Resume Analyzer - Testing Backend")
 print("=" * 60)
@@ -26,7 +56,7 @@ print("=" * 60)
 # Test 1: Health Check
 print("\n1️⃣ Testing Health Endpoint...")
 try:
-    response = requests.get(f"{BASE_URL}/health")
+    response = health_future.result()
     print(f"✅ Status: {response.status_code}")
     print(f"Response: {response.json()}")
 except Exception as e:
@@ -35,9 +65,7 @@ except Exception as e:
 # Test 2: Extract Skills Only
 print("\n2️⃣ Testing Skill Extraction...")
 try:
-    with open(RESUME_PATH, 'rb') as file:
-        files = {'resume_file': file}
-        response = requests.post(f"{BASE_URL}/api/extract-skills", files=files)
+    response = skills_future.result()
     
     print(f"✅ Status: {response.status_code}")
     if response.status_code == 200:
@@ -53,9 +81,7 @@ except Exception as e:
 # Test 3: Calculate ATS Score
 print("\n3️⃣ Testing ATS Score Calculation...")
 try:
-    with open(RESUME_PATH, 'rb') as file:
-        files = {'resume_file': file}
-        response = requests.post(f"{BASE_URL}/api/calculate-ats", files=files)
+    response = ats_future.result()
     
     print(f"✅ Status: {response.status_code}")
     if response.status_code == 200:
@@ -68,10 +94,7 @@ except Exception as e:
 # Test 4: Full Resume Analysis
 print("\n4️⃣ Testing Full Resume Analysis...")
 try:
-    with open(RESUME_PATH, 'rb') as file:
-        files = {'resume_file': file}
-        data = {'job_description': JOB_DESCRIPTION}
-        response = requests.post(f"{BASE_URL}/api/analyze", files=files, data=data)
+    response = analyze_future.result()
     
     print(f"✅ Status: {response.status_code}")
     if response.status_code == 200:
@@ -98,4 +121,5 @@ try:
 except Exception as e:
     print(f"❌ Error: {e}")
 
+executor.shutdown()
 print("\n✨ Testing Complete!")
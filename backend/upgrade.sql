@@ -0,0 +1,26 @@
+-- Upgrade an existing resume_analyses table to the current models.py schema.
+-- db.create_all() / flask --app app init-db only create missing tables and
+-- never alter existing ones. Safe to run more than once:
+--   psql "$DATABASE_URL" -f upgrade.sql
+
+BEGIN;
+
+-- Reuse stored analyses by content hash
+ALTER TABLE resume_analyses ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+CREATE INDEX IF NOT EXISTS ix_resume_analyses_content_hash
+    ON resume_analyses (content_hash);
+
+-- Newest-first listing in /api/history
+CREATE INDEX IF NOT EXISTS ix_resume_analyses_created_at
+    ON resume_analyses (created_at DESC);
+
+-- job_type is derived from job_description now
+ALTER TABLE resume_analyses DROP COLUMN IF EXISTS job_type;
+
+-- Skills columns were JSON text; the driver decodes jsonb directly
+-- (a no-op when they are already jsonb)
+ALTER TABLE resume_analyses
+    ALTER COLUMN skills_found TYPE jsonb USING skills_found::jsonb,
+    ALTER COLUMN missing_skills TYPE jsonb USING missing_skills::jsonb;
+
+COMMIT;
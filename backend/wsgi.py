@@ -0,0 +1,8 @@
+"""
+WSGI Entry Point
+Production server entry for gunicorn:
+
+    gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5000 wsgi:app --preload
+"""
+
+from app import app